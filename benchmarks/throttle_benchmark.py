@@ -0,0 +1,65 @@
+"""
+Measure the per-request cost of the token bucket throttles.
+
+Usage:
+    SECRET_KEY=bench python benchmarks/throttle_benchmark.py [iterations]
+
+Runs each throttle against a fake request with a fixed set of client IPs
+and prints the mean time per ``allow_request`` call, alongside DRF's
+history-list ``AnonRateThrottle`` for comparison. Set REDIS_URL to
+benchmark the shared cache store instead of process memory.
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'habitbloom.settings')
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from habitbloom.throttling import IPTokenBucketThrottle, get_bucket_store
+
+
+class BenchTokenBucketThrottle(IPTokenBucketThrottle):
+    scope = 'bench'
+    rate = '1000000/min'
+
+
+class BenchAnonRateThrottle(AnonRateThrottle):
+    scope = 'bench'
+    rate = '1000000/min'
+
+
+def run(throttle_class, requests, iterations):
+    throttle = throttle_class()
+    start = time.perf_counter()
+    for i in range(iterations):
+        throttle.allow_request(requests[i % len(requests)], None)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    factory = APIRequestFactory()
+    requests = []
+    for i in range(100):
+        request = factory.post('/api/auth/login/', REMOTE_ADDR=f'10.0.0.{i}')
+        request.user = AnonymousUser()
+        requests.append(request)
+
+    print(f"store: {type(get_bucket_store()).__name__}, {iterations} requests")
+    for throttle_class in (BenchTokenBucketThrottle, BenchAnonRateThrottle):
+        mean = run(throttle_class, requests, iterations)
+        print(f"{throttle_class.__name__:28} {mean * 1e6:8.2f} us/request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from django.conf import settings
+
+from .routers import REPLICA_DATABASE, begin_request, end_request, pin_user
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe API reads to the replica with read-your-writes stickiness.
+
+    When an authenticated request writes, its user is pinned to the
+    primary for a short window in the shared cache, so they always see
+    their own changes despite replication lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if REPLICA_DATABASE not in settings.DATABASES:
+            return self.get_response(request)
+
+        use_replica = request.method in SAFE_METHODS and request.path.startswith('/api/')
+        begin_request(request, use_replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            user_id = end_request()
+
+        if user_id is not None:
+            pin_user(user_id)
+        return response
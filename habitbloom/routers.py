@@ -0,0 +1,99 @@
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import SimpleLazyObject, empty
+
+REPLICA_DATABASE = 'replica'
+
+# Credentials and the user row are read while authenticating every request,
+# before the pin can be checked, so they always come from the primary
+PRIMARY_ONLY_APPS = {'sessions', 'authtoken', 'users'}
+
+_state = Local()
+
+
+def pin_cache_key(user_id):
+    return f'db_primary_pin_{user_id}'
+
+
+def begin_request(request, use_replica):
+    """Start routing for a request; reads go to the replica only if allowed."""
+    _state.request = request
+    _state.use_replica = use_replica
+    _state.wrote = False
+    _state.checked_user_id = None
+    _state.pinned = False
+
+
+def end_request():
+    """Stop routing for the current request and return its user id if it wrote."""
+    user_id = current_user_id() if getattr(_state, 'wrote', False) else None
+    _state.request = None
+    _state.use_replica = False
+    _state.wrote = False
+    return user_id
+
+
+def current_user_id():
+    """Id of the authenticated user of the current request, if already known.
+
+    Never triggers authentication itself, since that would run queries
+    from inside the router.
+    """
+    request = getattr(_state, 'request', None)
+    user = request.__dict__.get('user') if request is not None else None
+    if isinstance(user, SimpleLazyObject):
+        user = user._wrapped
+        if user is empty:
+            return None
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def is_pinned():
+    """Whether the current user wrote recently and must read from the primary."""
+    user_id = current_user_id()
+    if user_id is None:
+        return False
+    if user_id != _state.checked_user_id:
+        _state.checked_user_id = user_id
+        _state.pinned = caches[settings.REPLICA_PIN_CACHE].get(pin_cache_key(user_id)) is not None
+    return _state.pinned
+
+
+def pin_user(user_id):
+    """Keep ``user_id`` on the primary for ``REPLICA_PIN_SECONDS``."""
+    caches[settings.REPLICA_PIN_CACHE].set(pin_cache_key(user_id), 1, settings.REPLICA_PIN_SECONDS)
+
+
+class PrimaryReplicaRouter:
+    """Send reads to the replica during safe API requests.
+
+    Reads only leave the primary when ``ReplicaRoutingMiddleware`` has
+    allowed it for the current request and the user has not written
+    within the last ``REPLICA_PIN_SECONDS``. Once a request writes, the
+    rest of that request reads from the primary too.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            getattr(_state, 'use_replica', False)
+            and model._meta.app_label not in PRIMARY_ONLY_APPS
+            and REPLICA_DATABASE in settings.DATABASES
+            and not is_pinned()
+        ):
+            return REPLICA_DATABASE
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        _state.use_replica = False
+        _state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema by replication from the primary
+        return db != REPLICA_DATABASE or settings.MIGRATE_REPLICA
@@ -4,6 +4,7 @@ Django settings for habitbloom project.
 
 from pathlib import Path
 from decouple import config
+import dj_database_url
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'habitbloom.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,6 +94,35 @@ DATABASES = {
     }
 }
 
+# DATABASE_URL, when set, replaces the DB_* settings above
+if config('DATABASE_URL', default=''):
+    DATABASES['default'] = dj_database_url.parse(config('DATABASE_URL'))
+
+# Optional read replica - safe API reads are routed here when
+# REPLICA_DATABASE_URL or DB_REPLICA_HOST is set
+if config('REPLICA_DATABASE_URL', default=''):
+    DATABASES['replica'] = dj_database_url.parse(config('REPLICA_DATABASE_URL'))
+elif config('DB_REPLICA_HOST', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': config('DB_REPLICA_HOST'),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+    }
+
+DATABASE_ROUTERS = ['habitbloom.routers.PrimaryReplicaRouter']
+
+# The replica is a copy of the primary, so migrations only run on the primary
+MIGRATE_REPLICA = False
+
+# Users who wrote recently read from the primary for this many seconds. The
+# pin is kept in this cache alias, which must be shared between workers
+# (set REDIS_URL) for the pin to hold across them.
+REPLICA_PIN_CACHE = 'default'
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=15, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -138,10 +169,49 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'habitbloom.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'habitbloom.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    'PAGE_SIZE': 20,
+    # Proxies in front of the app whose X-Forwarded-For entries are trusted
+    # when throttling by client IP (Render adds one).
+    'NUM_PROXIES': config('NUM_PROXIES', default=0 if DEBUG else 1, cast=int),
+    'DEFAULT_THROTTLE_RATES': {
+        'login_user': config('THROTTLE_LOGIN_USER', default='5/min'),
+        'login_ip': config('THROTTLE_LOGIN_IP', default='20/min'),
+        'register_ip': config('THROTTLE_REGISTER_IP', default='10/hour'),
+        'complete_user': config('THROTTLE_COMPLETE_USER', default='30/min'),
+        'complete_ip': config('THROTTLE_COMPLETE_IP', default='120/min'),
+    },
 }
 
+# Cache - shared across workers when REDIS_URL is set, per-process memory otherwise
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cache alias holding throttle buckets. Only Redis and Memcached caches are
+# used; with any other backend buckets stay in each worker's memory.
+THROTTLE_CACHE = config('THROTTLE_CACHE', default='default')
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -182,6 +252,10 @@ CORS_ALLOW_METHODS = [
     'PUT',
 ]
 
+# Habit reminders
+HABIT_REMINDER_BACKEND = config('HABIT_REMINDER_BACKEND', default='habits.reminders.ConsoleReminderBackend')
+HABIT_REMINDER_FILE_PATH = config('HABIT_REMINDER_FILE_PATH', default=os.path.join(BASE_DIR, 'reminders.jsonl'))
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
@@ -0,0 +1,21 @@
+"""
+Settings for the test suite: a primary and a read replica as two local
+SQLite databases, so routing is exercised without a database server.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+    },
+}
+
+# The test replica is a separate empty database rather than a copy of the
+# primary, so it needs its own schema
+MIGRATE_REPLICA = True
@@ -0,0 +1,167 @@
+"""
+Read-replica routing tests, run against the two SQLite databases
+configured in habitbloom/test_settings.py, and token bucket tests.
+"""
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from habitbloom import throttling
+from habitbloom.throttling import CacheBucketStore, LocalBucketStore, get_bucket_store
+
+from habits.models import Habit
+from users.models import User
+
+
+class ReplicaRoutingTests(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        caches[settings.REPLICA_PIN_CACHE].clear()
+        self.user = self.create_user('reader@example.com', 'reader')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        # The replica copy differs so tests can tell which database answered.
+        Habit.objects.using('default').create(user=self.user, name='On primary')
+        Habit.objects.using('replica').create(user=self.user, name='On replica')
+
+    def create_user(self, email, username):
+        user = User.objects.db_manager('default').create_user(
+            email=email, username=username, password='password123'
+        )
+        User.objects.using('replica').bulk_create([user])
+        return user
+
+    def habit_names(self, client=None):
+        response = (client or self.client).get('/api/habits/')
+        self.assertEqual(response.status_code, 200)
+        return {habit['name'] for habit in response.data['results']}
+
+    def test_safe_api_reads_use_replica(self):
+        self.assertEqual(self.habit_names(), {'On replica'})
+
+    def test_writes_go_to_primary(self):
+        response = self.client.post('/api/habits/', {'name': 'New habit', 'frequency': 'daily'})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Habit.objects.using('default').filter(name='New habit').exists())
+        self.assertFalse(Habit.objects.using('replica').filter(name='New habit').exists())
+
+    def test_reads_after_write_are_pinned_to_primary(self):
+        self.client.post('/api/habits/', {'name': 'New habit', 'frequency': 'daily'})
+        self.assertEqual(self.habit_names(), {'On primary', 'New habit'})
+
+    def test_pin_is_per_user(self):
+        self.client.post('/api/habits/', {'name': 'New habit', 'frequency': 'daily'})
+
+        other = self.create_user('other@example.com', 'other')
+        Habit.objects.using('replica').create(user=other, name='Other on replica')
+        client = APIClient()
+        client.force_authenticate(other)
+        self.assertEqual(self.habit_names(client), {'Other on replica'})
+
+    def test_reads_return_to_replica_when_pin_expires(self):
+        self.client.post('/api/habits/', {'name': 'New habit', 'frequency': 'daily'})
+        caches[settings.REPLICA_PIN_CACHE].clear()
+        self.assertEqual(self.habit_names(), {'On replica'})
+
+
+class LocalBucketStoreTests(SimpleTestCase):
+    # '10/min': a burst of 10, then one request every 6 seconds
+    interval = 6
+    burst = 60
+
+    def setUp(self):
+        self.store = LocalBucketStore()
+
+    def consume(self, key='client', now=0):
+        return self.store.consume(key, self.interval, self.burst, now)
+
+    def test_allows_a_burst_then_returns_the_wait(self):
+        self.assertEqual([self.consume() for _ in range(10)], [0] * 10)
+        self.assertEqual(self.consume(now=1), 5)
+
+    def test_refills_one_token_per_interval(self):
+        for _ in range(10):
+            self.consume()
+        self.assertEqual(self.consume(now=6), 0)
+        self.assertEqual(self.consume(now=6), 6)
+        self.assertEqual([self.consume(now=60) for _ in range(9)], [0] * 9)
+
+    def test_rejected_requests_do_not_use_tokens(self):
+        for _ in range(10):
+            self.consume()
+        for _ in range(5):
+            self.consume(now=1)
+        self.assertEqual(self.consume(now=6), 0)
+
+    def test_idle_bucket_is_full_again(self):
+        for _ in range(10):
+            self.consume()
+        self.assertEqual([self.consume(now=1000) for _ in range(10)], [0] * 10)
+        self.assertEqual(self.consume(now=1000), 6)
+
+    def test_buckets_are_per_key(self):
+        for _ in range(10):
+            self.consume('a')
+        self.assertEqual(self.consume('b'), 0)
+
+    def test_evicts_least_recently_used_then_expired_buckets(self):
+        self.store.max_keys = 3
+        self.store.prune_batch = 2
+        for key in ('a', 'b', 'c', 'a'):
+            self.consume(key)
+
+        self.consume('d')
+        self.assertEqual(list(self.store.buckets), ['c', 'a', 'd'])
+
+        # 'c' is evicted as least recently used, then expired 'a' with it
+        self.consume('e', now=100)
+        self.assertEqual(list(self.store.buckets), ['d', 'e'])
+
+
+
+class CacheBucketStoreTests(LocalBucketStoreTests):
+
+    def setUp(self):
+        self.cache = LocMemCache('throttle-tests', {})
+        self.store = CacheBucketStore(self.cache)
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_evicts_least_recently_used_then_expired_buckets(self):
+        # The cache expires buckets itself once they would be full again
+        self.consume()
+        later = time.time() + self.burst + 2
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertIsNone(self.cache.get('client'))
+
+
+class GetBucketStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        throttling._store = None
+
+    def tearDown(self):
+        throttling._store = None
+
+    def test_caches_with_atomic_incr_are_shared(self):
+        with mock.patch.object(throttling, 'ATOMIC_CACHE_BACKENDS', ('django.core.cache.backends.locmem.LocMemCache',)):
+            self.assertIsInstance(get_bucket_store(), CacheBucketStore)
+
+    def test_other_caches_fall_back_to_process_memory(self):
+        for backend in (
+            'django.core.cache.backends.locmem.LocMemCache',
+            'django.core.cache.backends.db.DatabaseCache',
+            'django.core.cache.backends.filebased.FileBasedCache',
+        ):
+            throttling._store = None
+            caches_setting = {'default': {'BACKEND': backend, 'LOCATION': 'throttle-tests'}}
+            with self.subTest(backend=backend), override_settings(CACHES=caches_setting):
+                self.assertIsInstance(get_bucket_store(), LocalBucketStore)
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+# Caches whose ``incr`` is atomic across workers. Others, such as Django's
+# database and file caches, implement it as get + set, which races.
+ATOMIC_CACHE_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django_redis.cache.RedisCache',
+)
+
+
+class LocalBucketStore:
+    """Token buckets kept in process memory, one set per worker.
+
+    Buckets are kept in least-recently-used order and capped at
+    ``max_keys``; making room evicts at most ``prune_batch`` entries.
+    """
+    max_keys = 10000
+    prune_batch = 100
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = OrderedDict()
+
+    def consume(self, key, interval, burst, now):
+        """Take a token from the bucket and return seconds to wait, 0 if allowed.
+
+        Buckets are stored as the theoretical arrival time of the next
+        request (GCRA), which is equivalent to a token bucket holding
+        ``burst / interval`` tokens refilled at one token per ``interval``.
+        """
+        with self.lock:
+            tat = max(self.buckets.get(key, now), now) + interval
+            if tat - now > burst:
+                return tat - now - burst
+            if key in self.buckets:
+                self.buckets.move_to_end(key)
+            elif len(self.buckets) >= self.max_keys:
+                self._prune(now)
+            self.buckets[key] = tat
+            return 0
+
+    def _prune(self, now):
+        """Evict the least recently used bucket, plus up to ``prune_batch - 1`` expired ones."""
+        self.buckets.popitem(last=False)
+        for _ in range(self.prune_batch - 1):
+            if not self.buckets:
+                break
+            oldest = next(iter(self.buckets))
+            if self.buckets[oldest] > now:
+                break
+            del self.buckets[oldest]
+
+
+class CacheBucketStore:
+    """Token buckets kept in a shared cache, updated with atomic ``incr``."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def consume(self, key, interval, burst, now):
+        step = int(interval * 1000)
+        now_ms = int(now * 1000)
+        timeout = int(burst) + 1
+        try:
+            tat = self.cache.incr(key, step)
+        except ValueError:
+            if self.cache.add(key, now_ms + step, timeout):
+                return 0
+            tat = self.cache.incr(key, step)
+        if tat - step < now_ms:
+            # The bucket was idle and is full again; restart it from now.
+            self.cache.set(key, now_ms + step, timeout)
+            return 0
+        if tat - now_ms > burst * 1000:
+            self.cache.decr(key, step)
+            return (tat - now_ms) / 1000 - burst
+        self.cache.touch(key, timeout)
+        return 0
+
+
+_store = None
+
+
+def get_bucket_store():
+    """Use the shared cache when it has an atomic ``incr``, process memory otherwise."""
+    global _store
+    if _store is None:
+        alias = settings.THROTTLE_CACHE
+        if settings.CACHES[alias]['BACKEND'] in ATOMIC_CACHE_BACKENDS:
+            _store = CacheBucketStore(caches[alias])
+        else:
+            _store = LocalBucketStore()
+    return _store
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Rate throttle using a token bucket instead of a request history list.
+
+    ``rate`` is read as the bucket size and refill period, so ``'10/min'``
+    allows a burst of 10 requests and one more every 6 seconds. Subclasses
+    provide ``scope`` and ``get_cache_key`` as with DRF's throttles.
+    """
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        interval = self.duration / self.num_requests
+        self.wait_time = get_bucket_store().consume(self.key, interval, self.duration, time.time())
+        return self.wait_time == 0
+
+    def wait(self):
+        return self.wait_time
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per authenticated user, falling back to the client IP."""
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Bucket per client IP address."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from habitbloom.pagination import EstimatedCountPaginator
 from .models import Habit, Completion, Category
 
 
@@ -12,13 +13,23 @@ class CategoryAdmin(admin.ModelAdmin):
 class HabitAdmin(admin.ModelAdmin):
     list_display = ('name', 'user', 'category', 'frequency', 'points_per_completion', 'is_active')
     list_filter = ('frequency', 'is_active', 'category')
+    list_select_related = ('user', 'category')
     search_fields = ('name', 'user__username', 'user__email')
+    autocomplete_fields = ('user', 'category')
+    date_hierarchy = 'created_at'
     ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Completion)
 class CompletionAdmin(admin.ModelAdmin):
     list_display = ('habit', 'completed_at', 'notes')
     list_filter = ('completed_at', 'habit__frequency')
+    list_select_related = ('habit__user',)
     search_fields = ('habit__name', 'habit__user__username')
+    raw_id_fields = ('habit',)
+    date_hierarchy = 'completed_at'
     ordering = ('-completed_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,70 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from .search import search
+
+
+def int_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be an integer.'})
+
+
+def date_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: 'Must be a date in YYYY-MM-DD format.'})
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_habits(queryset, params):
+    """Apply ``category``, ``frequency`` and ``search`` query parameters to habits."""
+    category = int_param(params, 'category')
+    if category is not None:
+        queryset = queryset.filter(category_id=category)
+    frequency = params.get('frequency')
+    if frequency:
+        queryset = queryset.filter(frequency=frequency)
+    text = params.get('search', '').strip()
+    if text:
+        queryset = search(queryset, text)
+    return queryset
+
+
+def filter_completions(queryset, params):
+    """Apply ``habit``, ``category``, ``frequency``, ``from``, ``to`` and ``search`` to completions.
+
+    ``from`` and ``to`` are inclusive dates.
+    """
+    habit = int_param(params, 'habit')
+    if habit is not None:
+        queryset = queryset.filter(habit_id=habit)
+    category = int_param(params, 'category')
+    if category is not None:
+        queryset = queryset.filter(habit__category_id=category)
+    frequency = params.get('frequency')
+    if frequency:
+        queryset = queryset.filter(habit__frequency=frequency)
+    start = date_param(params, 'from')
+    if start is not None:
+        queryset = queryset.filter(completed_at__gte=start)
+    end = date_param(params, 'to')
+    if end is not None:
+        queryset = queryset.filter(completed_at__lt=end + timedelta(days=1))
+    text = params.get('search', '').strip()
+    if text:
+        queryset = search(queryset, text)
+    return queryset
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from habits.summaries import build_summaries, users_to_build, users_to_refresh, week_start_for
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class Command(BaseCommand):
+    help = "Build weekly summary snapshots for past weeks and refresh the current week."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weeks', type=int, default=1,
+                            help='Number of completed weeks to build, oldest first.')
+        parser.add_argument('--current-only', action='store_true',
+                            help='Only refresh the current week.')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of users per batch.')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of batches built in parallel.')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        current_week = week_start_for(today)
+
+        if not options['current_only']:
+            # Past weeks are built oldest first because streaks carry over.
+            # Users that already have a snapshot are skipped, so an
+            # interrupted run picks up where it stopped.
+            for weeks_ago in range(options['weeks'], 0, -1):
+                week_start = current_week - timedelta(weeks=weeks_ago)
+                user_ids = list(users_to_build(week_start))
+                self.build(week_start, user_ids, today, options)
+
+        self.build(current_week, users_to_refresh(current_week), today, options)
+
+    def build(self, week_start, user_ids, today, options):
+        def run(batch):
+            try:
+                return build_summaries(week_start, batch, today)
+            finally:
+                connection.close()
+
+        batches = list(chunked(user_ids, options['batch_size']))
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            built = sum(executor.map(run, batches))
+        self.stdout.write(f"Week of {week_start}: {built} summaries.")
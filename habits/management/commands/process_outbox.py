@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from habits.outbox import outbox_lag, process_batch
+
+
+class Command(BaseCommand):
+    help = "Apply pending outbox events such as completion points to users."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of events applied per transaction.')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when the outbox is empty.')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the outbox and exit instead of polling.')
+
+    def handle(self, *args, **options):
+        while True:
+            lag = outbox_lag()
+            processed = 0
+            while True:
+                count = process_batch(options['batch_size'])
+                processed += count
+                if count < options['batch_size']:
+                    break
+
+            if processed:
+                self.stdout.write(f"Processed {processed} events (lag {lag:.1f}s).")
+
+            if options['once']:
+                return
+            time.sleep(options['interval'])
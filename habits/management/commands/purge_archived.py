@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from habits.models import Habit
+from habits.purge import purge_habit, purge_user
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Permanently delete archived habits and deleted accounts with their completions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of completions deleted per statement.')
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Only purge habits and accounts deleted at least this long ago.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+
+        user_ids = list(User.objects.filter(deleted_at__lt=cutoff).values_list('pk', flat=True))
+        for user_id in user_ids:
+            purge_user(user_id, chunk_size)
+
+        habit_ids = list(Habit.objects.filter(archived_at__lt=cutoff).values_list('pk', flat=True))
+        for habit_id in habit_ids:
+            purge_habit(habit_id, chunk_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {len(user_ids)} accounts and {len(habit_ids)} archived habits."
+        ))
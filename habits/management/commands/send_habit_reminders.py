@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from habits.models import ReminderRun
+from habits.reminders import get_reminder_backend, iter_pending_batches
+
+
+class Command(BaseCommand):
+    help = "Send reminders to users with active habits not yet completed in the current period."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of users per delivery batch.')
+        parser.add_argument('--backend', default=None,
+                            help='Dotted path to a reminder backend, overriding HABIT_REMINDER_BACKEND.')
+        parser.add_argument('--restart', action='store_true',
+                            help="Ignore today's saved progress and start from the first user.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        run, created = ReminderRun.objects.get_or_create(period=today)
+
+        if options['restart'] and not created:
+            run.last_user_id = 0
+            run.reminders_sent = 0
+            run.finished_at = None
+            run.save(update_fields=['last_user_id', 'reminders_sent', 'finished_at'])
+        elif run.finished_at is not None:
+            self.stdout.write(f"Reminders for {today} already sent ({run.reminders_sent}).")
+            return
+        elif run.last_user_id:
+            self.stdout.write(f"Resuming reminders for {today} after user {run.last_user_id}.")
+
+        backend = get_reminder_backend(options['backend'], stream=self.stdout)
+        backend.open()
+        try:
+            for reminders in iter_pending_batches(today, options['batch_size'], run.last_user_id):
+                sent = backend.send_batch(reminders)
+                run.last_user_id = reminders[-1]['user_id']
+                run.reminders_sent += sent
+                run.save(update_fields=['last_user_id', 'reminders_sent'])
+        finally:
+            backend.close()
+
+        run.finished_at = timezone.now()
+        run.save(update_fields=['finished_at'])
+        self.stdout.write(self.style.SUCCESS(f"Sent {run.reminders_sent} reminders for {today}."))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(unique=True)),
+                ('last_user_id', models.BigIntegerField(default=0)),
+                ('reminders_sent', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-period'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='completion',
+            index=models.Index(fields=['habit', 'completed_at'], name='completion_habit_date_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('habits', '0004_outbox_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('completions', models.IntegerField(default=0)),
+                ('points_earned', models.IntegerField(default=0)),
+                ('total_points', models.IntegerField(default=0)),
+                ('level', models.IntegerField(default=1)),
+                ('habits', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-week_start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='weeklysummary',
+            constraint=models.UniqueConstraint(fields=('user', 'week_start'), name='weekly_summary_user_week'),
+        ),
+    ]
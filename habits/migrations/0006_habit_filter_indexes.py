@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0005_weekly_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', 'frequency'], name='habit_user_frequency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', 'category'], name='habit_user_category_idx'),
+        ),
+    ]
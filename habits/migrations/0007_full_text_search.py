@@ -0,0 +1,117 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:04
+
+from django.db import migrations
+
+# Postgres uses GIN expression indexes, so no column has to be added and
+# backfilled. They are built CONCURRENTLY to avoid blocking writes, which
+# is why this migration is not atomic. habits/search.py must query with
+# the same expressions for the indexes to be used.
+HABIT_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+COMPLETION_VECTOR = "to_tsvector('english', coalesce(notes, ''))"
+
+POSTGRES_FORWARDS = [
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS habit_search_idx ON habits_habit USING GIN (({HABIT_VECTOR}))",
+    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS completion_search_idx ON habits_completion USING GIN (({COMPLETION_VECTOR}))",
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX CONCURRENTLY IF EXISTS completion_search_idx",
+    "DROP INDEX CONCURRENTLY IF EXISTS habit_search_idx",
+]
+
+# SQLite uses external-content FTS5 tables kept in sync by triggers. Django
+# rebuilds SQLite tables on some schema changes, which drops the triggers,
+# so later migrations altering these tables must recreate them.
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE habits_habit_fts USING fts5(
+        name, description, content='habits_habit', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER habits_habit_fts_insert AFTER INSERT ON habits_habit BEGIN
+        INSERT INTO habits_habit_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER habits_habit_fts_delete AFTER DELETE ON habits_habit BEGIN
+        INSERT INTO habits_habit_fts(habits_habit_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER habits_habit_fts_update AFTER UPDATE OF name, description ON habits_habit BEGIN
+        INSERT INTO habits_habit_fts(habits_habit_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO habits_habit_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    "INSERT INTO habits_habit_fts(habits_habit_fts) VALUES ('rebuild')",
+    """
+    CREATE VIRTUAL TABLE habits_completion_fts USING fts5(
+        notes, content='habits_completion', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER habits_completion_fts_insert AFTER INSERT ON habits_completion BEGIN
+        INSERT INTO habits_completion_fts(rowid, notes) VALUES (new.id, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER habits_completion_fts_delete AFTER DELETE ON habits_completion BEGIN
+        INSERT INTO habits_completion_fts(habits_completion_fts, rowid, notes)
+        VALUES ('delete', old.id, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER habits_completion_fts_update AFTER UPDATE OF notes ON habits_completion BEGIN
+        INSERT INTO habits_completion_fts(habits_completion_fts, rowid, notes)
+        VALUES ('delete', old.id, old.notes);
+        INSERT INTO habits_completion_fts(rowid, notes) VALUES (new.id, new.notes);
+    END
+    """,
+    "INSERT INTO habits_completion_fts(habits_completion_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER habits_completion_fts_update",
+    "DROP TRIGGER habits_completion_fts_delete",
+    "DROP TRIGGER habits_completion_fts_insert",
+    "DROP TABLE habits_completion_fts",
+    "DROP TRIGGER habits_habit_fts_update",
+    "DROP TRIGGER habits_habit_fts_delete",
+    "DROP TRIGGER habits_habit_fts_insert",
+    "DROP TABLE habits_habit_fts",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {
+            'postgresql': postgres,
+            'sqlite': sqlite,
+        }.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('habits', '0006_habit_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARDS, SQLITE_FORWARDS),
+            run_for_vendor(POSTGRES_BACKWARDS, SQLITE_BACKWARDS),
+        ),
+    ]
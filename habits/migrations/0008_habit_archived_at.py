@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 14:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0007_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='habit',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
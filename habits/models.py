@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
 User = get_user_model()
 
@@ -16,6 +17,42 @@ class Category(models.Model):
         return self.name
 
 
+def period_starts(today):
+    """Return the start of the current daily and weekly periods as aware datetimes."""
+    day_start = timezone.make_aware(datetime.combine(today, time.min))
+    week_start = day_start - timedelta(days=today.weekday())
+    return day_start, week_start
+
+
+class HabitQuerySet(models.QuerySet):
+    """Habit queries by completion in the current period.
+    
+    Each is a single anti-join, so it costs one query regardless of how
+    many habits there are.
+    """
+    
+    def with_period_completion(self, today):
+        """Alias ``done_today`` and ``done_this_week`` onto the habits."""
+        day_start, week_start = period_starts(today)
+        completions = Completion.objects.filter(habit=OuterRef('pk'))
+        return self.alias(
+            done_today=Exists(completions.filter(completed_at__gte=day_start)),
+            done_this_week=Exists(completions.filter(completed_at__gte=week_start)),
+        )
+    
+    def completed(self, today):
+        """Habits completed in their current period."""
+        return self.with_period_completion(today).filter(
+            Q(frequency='daily', done_today=True) | Q(frequency='weekly', done_this_week=True)
+        )
+    
+    def pending(self, today):
+        """Habits with no completion in their current period."""
+        return self.with_period_completion(today).filter(
+            Q(frequency='daily', done_today=False) | Q(frequency='weekly', done_this_week=False)
+        )
+
+
 class Habit(models.Model):
     """User habits to track."""
     FREQUENCY_CHOICES = [
@@ -30,9 +67,18 @@ class Habit(models.Model):
     frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='daily')
     points_per_completion = models.IntegerField(default=10)
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    archived_at = models.DateTimeField(null=True, blank=True)  # Set when deleted by the user
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = HabitQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'frequency'], name='habit_user_frequency_idx'),
+            models.Index(fields=['user', 'category'], name='habit_user_category_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.user.username}: {self.name}"
     
@@ -81,20 +127,89 @@ class Habit(models.Model):
 class Completion(models.Model):
     """Record of habit completions."""
     habit = models.ForeignKey(Habit, on_delete=models.CASCADE, related_name='completions')
-    completed_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(auto_now_add=True, db_index=True)
     notes = models.TextField(blank=True)
     
     class Meta:
         ordering = ['-completed_at']
+        indexes = [
+            models.Index(fields=['habit', 'completed_at'], name='completion_habit_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.habit.name} - {self.completed_at.date()}"
     
     def save(self, *args, **kwargs):
-        """Override save to add points to user."""
+        """Override save to queue the points update for the outbox worker."""
         is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            # Add points to user
-            self.habit.user.add_points(self.habit.points_per_completion)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            if is_new:
+                OutboxEvent.objects.create(
+                    user_id=self.habit.user_id,
+                    event_type=OutboxEvent.COMPLETION_CREATED,
+                    payload={
+                        'completion_id': self.pk,
+                        'habit_id': self.habit_id,
+                        'points': self.habit.points_per_completion,
+                    },
+                )
+
+
+class OutboxEvent(models.Model):
+    """Derived-state update written in the same transaction as its source row.
+
+    Events are drained by the ``process_outbox`` command.
+    """
+    COMPLETION_CREATED = 'completion.created'
+    EVENT_TYPE_CHOICES = [
+        (COMPLETION_CREATED, 'Completion created'),
+    ]
+    
+    user_id = models.BigIntegerField(db_index=True)
+    event_type = models.CharField(max_length=50, choices=EVENT_TYPE_CHOICES)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"{self.event_type} for user {self.user_id}"
+
+
+class ReminderRun(models.Model):
+    """Progress of the daily reminder batch job, so an interrupted run can resume."""
+    period = models.DateField(unique=True)
+    last_user_id = models.BigIntegerField(default=0)
+    reminders_sent = models.IntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-period']
+    
+    def __str__(self):
+        return f"Reminders for {self.period}"
+
+
+class WeeklySummary(models.Model):
+    """Precomputed week-in-review for one user, filled in by ``build_weekly_summaries``."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='weekly_summaries')
+    week_start = models.DateField()
+    completions = models.IntegerField(default=0)
+    points_earned = models.IntegerField(default=0)
+    total_points = models.IntegerField(default=0)  # At the end of the week
+    level = models.IntegerField(default=1)  # At the end of the week
+    habits = models.JSONField(default=list)  # Per-habit completions and streaks
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-week_start']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'week_start'], name='weekly_summary_user_week'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}: week of {self.week_start}"
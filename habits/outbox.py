@@ -0,0 +1,89 @@
+import copy
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import IntegerField, Sum
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+User = get_user_model()
+
+
+def apply_completion_points(events):
+    """Add completion points to users, one bulk update for the whole batch."""
+    points = defaultdict(int)
+    for event in events:
+        points[event.user_id] += event.payload.get('points', 0)
+
+    users = list(User.objects.select_for_update().filter(pk__in=points))
+    now = timezone.now()
+    for user in users:
+        user.add_points(points[user.pk])
+        user.updated_at = now
+    User.objects.bulk_update(users, ['total_points', 'current_level', 'updated_at'])
+
+
+HANDLERS = {
+    OutboxEvent.COMPLETION_CREATED: apply_completion_points,
+}
+
+
+def process_batch(batch_size=500):
+    """Apply and delete the oldest pending events; return how many were handled.
+
+    Events are grouped by type and each handler receives the whole group,
+    so several events for one user collapse into a single update. The
+    events are deleted in the same transaction as the updates they cause,
+    and a crash before commit leaves them to be processed again.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        by_type = defaultdict(list)
+        for event in events:
+            by_type[event.event_type].append(event)
+        for event_type, group in by_type.items():
+            HANDLERS[event_type](group)
+
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+    return len(events)
+
+
+def outbox_lag():
+    """Seconds since the oldest pending event was written, 0 when drained."""
+    oldest = OutboxEvent.objects.order_by('id').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return 0
+    return (timezone.now() - oldest).total_seconds()
+
+
+def pending_points(user_ids):
+    """Points from unprocessed completion events, by user id."""
+    return dict(
+        OutboxEvent.objects.filter(user_id__in=user_ids, event_type=OutboxEvent.COMPLETION_CREATED)
+        .values('user_id')
+        .annotate(points=Sum(Cast(KeyTextTransform('points', 'payload'), IntegerField())))
+        .order_by()
+        .values_list('user_id', 'points')
+    )
+
+
+def include_pending_points(user):
+    """Return a copy of ``user`` with points from unprocessed events added.
+
+    Lets responses show points right after a completion, before the
+    worker has applied it. ``user`` itself is left unchanged, so saving
+    it cannot store the pending points ahead of the worker.
+    """
+    pending = pending_points([user.pk]).get(user.pk, 0)
+    user = copy.copy(user)
+    user.add_points(pending)
+    return user
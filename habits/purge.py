@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+
+from .models import Habit, Completion
+
+User = get_user_model()
+
+
+def purge_habit(habit_id, chunk_size=1000):
+    """Delete a habit's completions in bounded chunks, then the habit itself.
+
+    Each chunk is its own short statement, so no single delete holds
+    locks for long however large the habit's history is.
+    """
+    while True:
+        ids = list(
+            Completion.objects.filter(habit_id=habit_id)
+            .order_by()
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        Completion.objects.filter(pk__in=ids).delete()
+    Habit.objects.filter(pk=habit_id).delete()
+
+
+def purge_user(user_id, chunk_size=1000):
+    """Delete a deleted account's habits chunk by chunk, then the user."""
+    for habit_id in Habit.objects.filter(user_id=user_id).values_list('pk', flat=True):
+        purge_habit(habit_id, chunk_size)
+    User.objects.filter(pk=user_id).delete()
@@ -0,0 +1,111 @@
+import json
+import sys
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import Habit
+
+
+def pending_habits(today):
+    """Active habits of active users with no completion in their current period."""
+    return Habit.objects.filter(is_active=True, user__is_active=True).pending(today)
+
+
+def iter_pending_batches(today, batch_size=500, after_user_id=0):
+    """Yield lists of reminders, one entry per user, ordered by user id.
+
+    Batches are cut on user boundaries so the last user id of each batch
+    can be stored as a resume cursor.
+    """
+    pending = pending_habits(today)
+    cursor = after_user_id
+    while True:
+        user_ids = list(
+            pending.filter(user_id__gt=cursor)
+            .order_by('user_id')
+            .values_list('user_id', flat=True)
+            .distinct()[:batch_size]
+        )
+        if not user_ids:
+            return
+        rows = (
+            pending.filter(user_id__in=user_ids)
+            .order_by('user_id', 'id')
+            .values_list('user_id', 'user__email', 'user__username', 'id', 'name')
+        )
+        reminders = []
+        for user_id, email, username, habit_id, name in rows:
+            if not reminders or reminders[-1]['user_id'] != user_id:
+                reminders.append({
+                    'user_id': user_id,
+                    'email': email,
+                    'username': username,
+                    'habits': [],
+                })
+            reminders[-1]['habits'].append({'id': habit_id, 'name': name})
+        # Everyone in the batch may have checked in between the two queries.
+        if reminders:
+            yield reminders
+        cursor = user_ids[-1]
+
+
+class BaseReminderBackend:
+    """Delivery backend interface for reminder batches."""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def open(self):
+        pass
+
+    def send_batch(self, reminders):
+        """Deliver a batch of reminders and return how many were sent."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ConsoleReminderBackend(BaseReminderBackend):
+    """Write reminders to a stream, stdout by default."""
+
+    def __init__(self, stream=None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream or sys.stdout
+
+    def send_batch(self, reminders):
+        for reminder in reminders:
+            names = ', '.join(habit['name'] for habit in reminder['habits'])
+            self.stream.write(f"{reminder['email']}: {names}\n")
+        self.stream.flush()
+        return len(reminders)
+
+
+class FileReminderBackend(BaseReminderBackend):
+    """Append reminders as JSON lines to a file."""
+
+    def __init__(self, path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path or settings.HABIT_REMINDER_FILE_PATH
+        self.file = None
+
+    def open(self):
+        self.file = open(self.path, 'a', encoding='utf-8')
+
+    def send_batch(self, reminders):
+        for reminder in reminders:
+            self.file.write(json.dumps(reminder) + '\n')
+        self.file.flush()
+        return len(reminders)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def get_reminder_backend(path=None, **kwargs):
+    """Instantiate the configured reminder backend."""
+    backend_class = import_string(path or settings.HABIT_REMINDER_BACKEND)
+    return backend_class(**kwargs)
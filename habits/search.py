@@ -0,0 +1,64 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+# Full-text tables, Postgres index expressions and fallback fields per model.
+# The expressions must match the GIN indexes created in migration 0007.
+SEARCH_CONFIG = {
+    'habits_habit': {
+        'fts_table': 'habits_habit_fts',
+        'vector': (
+            "setweight(to_tsvector('english', coalesce(\"habits_habit\".\"name\", '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(\"habits_habit\".\"description\", '')), 'B')"
+        ),
+        'fields': ('name', 'description'),
+    },
+    'habits_completion': {
+        'fts_table': 'habits_completion_fts',
+        'vector': "to_tsvector('english', coalesce(\"habits_completion\".\"notes\", ''))",
+        'fields': ('notes',),
+    },
+}
+
+
+def fts5_query(text):
+    """Quote each word so user input cannot use FTS5 query syntax."""
+    words = re.findall(r'\w+', text)
+    return ' '.join('"%s"' % word for word in words)
+
+
+def search(queryset, text):
+    """Filter ``queryset`` to rows matching ``text`` using the database's full-text index.
+
+    Postgres matches the GIN-indexed tsvector expression with
+    ``websearch_to_tsquery``; SQLite matches the FTS5 table. Other
+    databases fall back to ``icontains``.
+    """
+    table = queryset.model._meta.db_table
+    config = SEARCH_CONFIG[table]
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql':
+        match = RawSQL(
+            f"({config['vector']}) @@ websearch_to_tsquery('english', %s)",
+            (text,),
+            output_field=BooleanField(),
+        )
+        return queryset.alias(search_match=match).filter(search_match=True)
+
+    if vendor == 'sqlite':
+        query = fts5_query(text)
+        if not query:
+            return queryset.none()
+        fts_table = config['fts_table']
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s',
+            (query,),
+        ))
+
+    condition = Q()
+    for field in config['fields']:
+        condition |= Q(**{f'{field}__icontains': text})
+    return queryset.filter(condition)
@@ -1,5 +1,62 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from .models import Habit, Completion, Category
+from .models import Habit, Completion, Category, WeeklySummary
+
+User = get_user_model()
+
+
+def parse_fieldset(value, path):
+    """Return the field names in a ``fields``/``omit`` value that apply at ``path``.
+
+    Names are comma separated and nested serializers are addressed with
+    dots, e.g. ``total_points,habits.name``. For ``fields`` the parent of
+    a dotted name is also included so the nested field is kept.
+    """
+    prefix = f"{path}." if path else ''
+    names = set()
+    for name in value.split(','):
+        name = name.strip()
+        if name.startswith(prefix):
+            names.add(name[len(prefix):])
+    return names
+
+
+class SparseFieldsetMixin:
+    """Limit serialized fields with the ``?fields=`` and ``?omit=`` query parameters.
+
+    Fields are dropped before serialization, so omitted method fields are
+    never computed. Only applies to safe-method requests.
+    """
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return fields
+        
+        path = self.sparse_path()
+        requested = request.query_params.get('fields')
+        if requested:
+            # Names that are not fields here are ignored rather than dropping everything
+            keep = {name.split('.')[0] for name in parse_fieldset(requested, path)} & fields.keys()
+            if keep:
+                for name in set(fields) - keep:
+                    fields.pop(name)
+        omitted = request.query_params.get('omit')
+        if omitted:
+            for name in parse_fieldset(omitted, path):
+                fields.pop(name, None)
+        return fields
+    
+    def sparse_path(self):
+        """Dotted path of this serializer from the root, e.g. ``habits``."""
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -9,7 +66,7 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'color', 'icon')
 
 
-class HabitSerializer(serializers.ModelSerializer):
+class HabitSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for habits."""
     streak = serializers.SerializerMethodField()
     is_completed_today = serializers.SerializerMethodField()
@@ -40,7 +97,7 @@ class HabitCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CompletionSerializer(serializers.ModelSerializer):
+class CompletionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for habit completions."""
     habit_name = serializers.CharField(source='habit.name', read_only=True)
     
@@ -54,7 +111,7 @@ class CompletionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class DashboardSerializer(serializers.Serializer):
+class DashboardSerializer(SparseFieldsetMixin, serializers.Serializer):
     """Serializer for dashboard data."""
     total_habits = serializers.IntegerField()
     completed_today = serializers.IntegerField()
@@ -63,3 +120,16 @@ class DashboardSerializer(serializers.Serializer):
     level_progress = serializers.DictField()
     habits = HabitSerializer(many=True)
     recent_completions = CompletionSerializer(many=True)
+
+
+class WeeklySummarySerializer(serializers.ModelSerializer):
+    """Serializer for weekly summary snapshots."""
+    level_progress = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = WeeklySummary
+        fields = ('week_start', 'completions', 'points_earned', 'total_points', 
+                 'level', 'level_progress', 'habits')
+    
+    def get_level_progress(self, obj):
+        return User.level_progress_for(obj.total_points, obj.level)
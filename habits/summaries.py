@@ -0,0 +1,214 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Completion, Habit, WeeklySummary
+from .outbox import pending_points
+
+User = get_user_model()
+
+
+def week_start_for(day):
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def week_range(week_start):
+    """Aware datetimes bounding the week, end exclusive."""
+    start = timezone.make_aware(datetime.combine(week_start, time.min))
+    return start, start + timedelta(days=7)
+
+
+def week_completions(start, end):
+    """Completions between ``start`` and ``end``, leaving out deleted habits."""
+    return Completion.objects.filter(
+        completed_at__gte=start, completed_at__lt=end, habit__archived_at__isnull=True
+    )
+
+
+def users_to_build(week_start):
+    """Users needing a final snapshot for a past week.
+
+    That is users with completions in the week, or with streaks in the
+    previous week's snapshot, whose snapshot for the week is missing or
+    was built before the week ended (e.g. by a mid-week refresh).
+    """
+    start, end = week_range(week_start)
+    final = WeeklySummary.objects.filter(week_start=week_start, updated_at__gte=end)
+    active = set(
+        week_completions(start, end)
+        .exclude(habit__user_id__in=final.values('user_id'))
+        .order_by()
+        .values_list('habit__user_id', flat=True)
+        .distinct()
+    )
+    active.update(
+        WeeklySummary.objects.filter(week_start=week_start - timedelta(days=7))
+        .exclude(habits=[])
+        .exclude(user_id__in=final.values('user_id'))
+        .values_list('user_id', flat=True)
+    )
+    return sorted(active)
+
+
+def users_to_refresh(week_start):
+    """Users whose current-week snapshot is missing or older than their last completion."""
+    start, end = week_range(week_start)
+    latest = (
+        week_completions(start, end)
+        .values('habit__user_id')
+        .annotate(latest=Max('completed_at'))
+        .order_by('habit__user_id')
+        .values_list('habit__user_id', 'latest')
+    )
+    built = dict(
+        WeeklySummary.objects.filter(week_start=week_start).values_list('user_id', 'updated_at')
+    )
+    user_ids = {user_id for user_id, last in latest if user_id not in built or last > built[user_id]}
+    # Users carrying streaks from last week get a snapshot even before they check in.
+    user_ids.update(
+        WeeklySummary.objects.filter(week_start=week_start - timedelta(days=7))
+        .exclude(habits=[])
+        .exclude(user_id__in=built)
+        .values_list('user_id', flat=True)
+    )
+    return sorted(user_ids)
+
+
+def daily_streak(days, week_start, last_day, previous):
+    """Streak at ``last_day`` given the days completed this week."""
+    run = 0
+    day = last_day
+    while day >= week_start and day in days:
+        run += 1
+        day -= timedelta(days=1)
+    if run == (last_day - week_start).days + 1:
+        return previous + run
+    return run
+
+
+def build_summaries(week_start, user_ids, today=None):
+    """Compute and store snapshots for ``user_ids`` for one week.
+
+    Uses a fixed number of queries per batch. Streaks continue from the
+    previous week's snapshots, so weeks must be built oldest first.
+    Habits with a streak last week but no completions this week are kept
+    with their lost streak, except weekly habits in a week still in
+    progress, which can still be completed.
+    """
+    today = today or timezone.localdate()
+    # Sunday is still part of the week, so weekly habits can be completed that day
+    in_progress = week_start + timedelta(days=6) >= today
+    start, end = week_range(week_start)
+    last_day = min(week_start + timedelta(days=6), today)
+
+    habits = {}
+    for habit_id, user_id, name, frequency, points, day in (
+        week_completions(start, end)
+        .filter(habit__user_id__in=user_ids)
+        .annotate(day=TruncDate('completed_at'))
+        .order_by()
+        .values_list('habit_id', 'habit__user_id', 'habit__name', 'habit__frequency',
+                     'habit__points_per_completion', 'day')
+    ):
+        habit = habits.setdefault(habit_id, {
+            'user_id': user_id, 'name': name, 'frequency': frequency,
+            'points': points, 'completions': 0, 'days': set(),
+        })
+        habit['completions'] += 1
+        habit['days'].add(day)
+
+    previous = defaultdict(dict)
+    for user_id, habit_list in WeeklySummary.objects.filter(
+        user_id__in=user_ids, week_start=week_start - timedelta(days=7)
+    ).values_list('user_id', 'habits'):
+        for entry in habit_list:
+            previous[user_id][entry['habit_id']] = entry
+    # Streaks of deleted habits are not carried forward
+    archived = set(
+        Habit.objects.filter(
+            pk__in=[habit_id for entries in previous.values() for habit_id in entries],
+            archived_at__isnull=False,
+        ).values_list('pk', flat=True)
+    )
+
+    later_points = dict(
+        Completion.objects.filter(habit__user_id__in=user_ids, completed_at__gte=end)
+        .values('habit__user_id')
+        .annotate(points=Sum('habit__points_per_completion'))
+        .order_by()
+        .values_list('habit__user_id', 'points')
+    )
+    current_points = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'total_points'))
+    # Completions the outbox worker has not applied yet are not in total_points
+    for user_id, points in pending_points(user_ids).items():
+        if user_id in current_points:
+            current_points[user_id] += points
+
+    summaries = {}
+
+    def summary_for(user_id):
+        if user_id not in summaries:
+            total_points = current_points[user_id] - later_points.get(user_id, 0)
+            summaries[user_id] = WeeklySummary(
+                user_id=user_id,
+                week_start=week_start,
+                total_points=total_points,
+                level=User.level_for_points(total_points),
+                habits=[],
+            )
+        return summaries[user_id]
+
+    for habit_id, habit in sorted(habits.items()):
+        user_id = habit['user_id']
+        if user_id not in current_points:
+            continue
+        previous_streak = previous[user_id].pop(habit_id, {}).get('streak', 0)
+        if habit['frequency'] == 'daily':
+            streak = daily_streak(habit['days'], week_start, last_day, previous_streak)
+        else:
+            streak = previous_streak + 1
+
+        summary = summary_for(user_id)
+        summary.completions += habit['completions']
+        summary.points_earned += habit['completions'] * habit['points']
+        summary.habits.append({
+            'habit_id': habit_id,
+            'name': habit['name'],
+            'frequency': habit['frequency'],
+            'completions': habit['completions'],
+            'streak': streak,
+            'streak_change': streak - previous_streak,
+        })
+
+    # Habits left over from last week had no completions this week. Users
+    # carried over get a snapshot even if empty, which ends the carry chain.
+    for user_id, entries in previous.items():
+        if user_id not in current_points:
+            continue
+        summary = summary_for(user_id)
+        for habit_id, entry in sorted(entries.items()):
+            if not entry['streak'] or habit_id in archived:
+                continue
+            kept = in_progress and entry.get('frequency') == 'weekly'
+            streak = entry['streak'] if kept else 0
+            summary.habits.append({
+                'habit_id': habit_id,
+                'name': entry['name'],
+                'frequency': entry.get('frequency'),
+                'completions': 0,
+                'streak': streak,
+                'streak_change': streak - entry['streak'],
+            })
+
+    WeeklySummary.objects.bulk_create(
+        summaries.values(),
+        update_conflicts=True,
+        unique_fields=['user', 'week_start'],
+        update_fields=['completions', 'points_earned', 'total_points', 'level', 'habits', 'updated_at'],
+    )
+    return len(summaries)
@@ -0,0 +1,277 @@
+import json
+import tempfile
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, modify_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+
+from .models import Completion, Habit, ReminderRun, WeeklySummary
+from .outbox import process_batch
+from .reminders import iter_pending_batches, pending_habits
+from .summaries import build_summaries, users_to_build, week_start_for
+
+
+# Replica routing is covered in habitbloom/tests.py; API tests here read the primary
+primary_only = modify_settings(MIDDLEWARE={'remove': 'habitbloom.middleware.ReplicaRoutingMiddleware'})
+
+
+def at(day, hour=12):
+    """Aware datetime on ``day`` at ``hour``."""
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def create_user(username, **kwargs):
+    return User.objects.create_user(
+        email=f'{username}@example.com', username=username, password='password123', **kwargs
+    )
+
+
+def complete(habit, when):
+    completion = Completion.objects.create(habit=habit)
+    # completed_at is auto_now_add, so move it afterwards
+    Completion.objects.filter(pk=completion.pk).update(completed_at=when)
+    return completion
+
+
+class PendingHabitsTests(TestCase):
+    # A Wednesday, so the week started two days earlier
+    today = date(2026, 10, 21)
+
+    def setUp(self):
+        self.user = create_user('pending')
+
+    def pending_names(self):
+        return set(pending_habits(self.today).values_list('name', flat=True))
+
+    def test_daily_habit_is_pending_until_completed_today(self):
+        done = Habit.objects.create(user=self.user, name='Done today')
+        complete(done, at(self.today, 8))
+        yesterday = Habit.objects.create(user=self.user, name='Done yesterday')
+        complete(yesterday, at(self.today - timedelta(days=1), 23))
+        Habit.objects.create(user=self.user, name='Never done')
+
+        self.assertEqual(self.pending_names(), {'Done yesterday', 'Never done'})
+
+    def test_weekly_habit_is_pending_until_completed_this_week(self):
+        done = Habit.objects.create(user=self.user, name='Done Monday', frequency='weekly')
+        complete(done, at(self.today - timedelta(days=2), 0))
+        last_week = Habit.objects.create(user=self.user, name='Done last Sunday', frequency='weekly')
+        complete(last_week, at(self.today - timedelta(days=3), 23))
+
+        self.assertEqual(self.pending_names(), {'Done last Sunday'})
+
+    def test_inactive_habits_and_users_are_skipped(self):
+        Habit.objects.create(user=self.user, name='Paused', is_active=False)
+        inactive = create_user('inactive', is_active=False)
+        Habit.objects.create(user=inactive, name='Inactive user')
+        Habit.objects.create(user=self.user, name='Active')
+
+        self.assertEqual(self.pending_names(), {'Active'})
+
+    def test_batches_are_cut_on_user_boundaries(self):
+        users = [self.user, create_user('second'), create_user('third')]
+        for user in users:
+            Habit.objects.create(user=user, name='Run')
+            Habit.objects.create(user=user, name='Read')
+
+        batches = list(iter_pending_batches(self.today, batch_size=2))
+
+        self.assertEqual(
+            [[reminder['user_id'] for reminder in batch] for batch in batches],
+            [[users[0].pk, users[1].pk], [users[2].pk]],
+        )
+        self.assertEqual([habit['name'] for habit in batches[0][0]['habits']], ['Run', 'Read'])
+        self.assertEqual(list(iter_pending_batches(self.today, after_user_id=users[1].pk)), [batches[1]])
+
+
+class SendHabitRemindersTests(TestCase):
+
+    def setUp(self):
+        self.users = [create_user('first'), create_user('second'), create_user('third')]
+        for user in self.users:
+            Habit.objects.create(user=user, name=f'Habit of {user.username}')
+
+    def send(self, *args):
+        out = StringIO()
+        call_command('send_habit_reminders', *args, stdout=out)
+        return out.getvalue()
+
+    def test_sends_to_console_and_records_the_run(self):
+        output = self.send('--batch-size', '2')
+
+        for user in self.users:
+            self.assertIn(f'{user.email}: Habit of {user.username}', output)
+        run = ReminderRun.objects.get(period=timezone.localdate())
+        self.assertEqual(run.last_user_id, self.users[-1].pk)
+        self.assertEqual(run.reminders_sent, 3)
+        self.assertIsNotNone(run.finished_at)
+        self.assertIn('already sent', self.send())
+
+    def test_resumes_after_last_user_id(self):
+        ReminderRun.objects.create(
+            period=timezone.localdate(), last_user_id=self.users[0].pk, reminders_sent=1
+        )
+
+        output = self.send()
+
+        self.assertIn(f'Resuming reminders for {timezone.localdate()} after user {self.users[0].pk}', output)
+        self.assertNotIn(self.users[0].email, output)
+        self.assertIn(self.users[1].email, output)
+        self.assertIn(self.users[2].email, output)
+        self.assertEqual(ReminderRun.objects.get().reminders_sent, 3)
+
+    def test_restart_sends_from_the_first_user(self):
+        ReminderRun.objects.create(
+            period=timezone.localdate(), last_user_id=self.users[-1].pk,
+            reminders_sent=3, finished_at=timezone.now(),
+        )
+
+        output = self.send('--restart')
+
+        self.assertIn(self.users[0].email, output)
+        self.assertEqual(ReminderRun.objects.get().reminders_sent, 3)
+
+    def test_file_backend_writes_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'reminders.jsonl'
+            with self.settings(HABIT_REMINDER_FILE_PATH=str(path)):
+                self.send('--backend', 'habits.reminders.FileReminderBackend')
+            reminders = [json.loads(line) for line in path.read_text().splitlines()]
+
+        self.assertEqual([reminder['user_id'] for reminder in reminders], [user.pk for user in self.users])
+
+
+@primary_only
+class OutboxPointsTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('points')
+        self.habit = Habit.objects.create(user=self.user, name='Run', points_per_completion=60)
+        self.client = APIClient()
+        # The same user object is reused for every request, as in one long request
+        self.client.force_authenticate(self.user)
+
+    def profile_points(self):
+        data = self.client.get('/api/auth/profile/').data
+        return data['total_points'], data['current_level']
+
+    def test_pending_points_are_shown_without_changing_the_user(self):
+        self.client.post(f'/api/habits/{self.habit.pk}/complete/')
+
+        self.assertEqual(self.profile_points(), (60, 1))
+        self.assertEqual(self.profile_points(), (60, 1))
+        dashboard = self.client.get('/api/habits/dashboard/?fields=total_points,current_level').data
+        self.assertEqual(dict(dashboard), {'total_points': 60, 'current_level': 1})
+        self.assertEqual(self.user.total_points, 0)
+
+    def test_worker_applies_points_and_levels_once(self):
+        complete(self.habit, timezone.now() - timedelta(days=1))
+        self.client.post(f'/api/habits/{self.habit.pk}/complete/')
+        self.assertEqual(self.profile_points(), (120, 2))
+
+        self.assertEqual(process_batch(), 2)
+
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.total_points, self.user.current_level), (120, 2))
+        self.assertEqual(self.profile_points(), (120, 2))
+
+
+@primary_only
+class ArchivedHabitTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('archive')
+        self.habit = Habit.objects.create(user=self.user, name='Run')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.last_week = week_start_for(timezone.localdate()) - timedelta(days=7)
+        complete(self.habit, at(self.last_week))
+        complete(self.habit, timezone.now())
+
+    def completion_count(self):
+        return self.client.get('/api/completions/').data['count']
+
+    def recent_count(self):
+        return len(self.client.get('/api/habits/dashboard/?fields=recent_completions').data['recent_completions'])
+
+    def test_paused_habits_keep_their_history(self):
+        self.client.patch(f'/api/habits/{self.habit.pk}/', {'is_active': False})
+
+        self.assertEqual(self.completion_count(), 2)
+        self.assertGreater(self.recent_count(), 0)
+        self.assertEqual(users_to_build(self.last_week), [self.user.pk])
+
+    def test_deleted_habits_are_hidden_until_purged(self):
+        self.client.delete(f'/api/habits/{self.habit.pk}/')
+
+        self.assertEqual(Completion.objects.count(), 2)
+        self.assertEqual(self.completion_count(), 0)
+        self.assertEqual(self.recent_count(), 0)
+        self.assertEqual(users_to_build(self.last_week), [])
+        build_summaries(self.last_week, [self.user.pk])
+        self.assertFalse(WeeklySummary.objects.exists())
+
+
+@primary_only
+class WeeklySummaryTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('summary')
+        self.week_start = week_start_for(timezone.localdate())
+
+    def test_level_progress_matches_profile(self):
+        self.user.add_points(150)
+        self.user.save()
+        WeeklySummary.objects.create(user=self.user, week_start=self.week_start, total_points=150, level=2)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        summary = client.get('/api/habits/weekly-summary/').data[0]['level_progress']
+        profile = client.get('/api/auth/profile/').data['level_progress']
+
+        self.assertEqual(summary, {'current': 50, 'needed': 100, 'percentage': 50.0})
+        self.assertIsInstance(summary['percentage'], float)
+        self.assertEqual(summary, profile)
+
+    def test_totals_include_points_still_in_the_outbox(self):
+        habit = Habit.objects.create(user=self.user, name='Run', points_per_completion=60)
+        last_week = self.week_start - timedelta(days=7)
+        complete(habit, at(last_week))
+        complete(habit, at(last_week + timedelta(days=1)))
+        complete(habit, timezone.now())
+        process_batch(batch_size=1)
+
+        build_summaries(last_week, [self.user.pk])
+
+        summary = WeeklySummary.objects.get(week_start=last_week)
+        self.assertEqual((summary.total_points, summary.level), (120, 2))
+
+    def carried_streak(self, *days):
+        """Streak of a weekly habit carried into the week of 2026-10-12, built on each of ``days``."""
+        week_start = date(2026, 10, 12)
+        habit = Habit.objects.create(user=self.user, name='Review', frequency='weekly')
+        WeeklySummary.objects.create(
+            user=self.user, week_start=week_start - timedelta(days=7), habits=[{
+                'habit_id': habit.pk, 'name': habit.name, 'frequency': 'weekly',
+                'completions': 1, 'streak': 2, 'streak_change': 1,
+            }],
+        )
+        streaks = []
+        for today in days:
+            build_summaries(week_start, [self.user.pk], today=today)
+            entry = WeeklySummary.objects.get(week_start=week_start).habits[0]
+            streaks.append((entry['streak'], entry['streak_change']))
+        return streaks
+
+    def test_weekly_streak_is_kept_through_sunday(self):
+        saturday, sunday = date(2026, 10, 17), date(2026, 10, 18)
+        self.assertEqual(self.carried_streak(saturday, sunday), [(2, 0), (2, 0)])
+
+    def test_weekly_streak_is_lost_once_the_week_ends(self):
+        self.assertEqual(self.carried_streak(date(2026, 10, 19)), [(0, -2)])
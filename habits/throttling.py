@@ -0,0 +1,9 @@
+from habitbloom.throttling import IPTokenBucketThrottle, UserTokenBucketThrottle
+
+
+class CompleteUserThrottle(UserTokenBucketThrottle):
+    scope = 'complete_user'
+
+
+class CompleteIPThrottle(IPTokenBucketThrottle):
+    scope = 'complete_ip'
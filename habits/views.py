@@ -3,12 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Q
+from django.utils import timezone
 from datetime import date, timedelta
-from .models import Habit, Completion, Category
+from .models import Habit, Completion, Category, WeeklySummary
 from .serializers import (
     HabitSerializer, HabitCreateSerializer, CompletionSerializer, 
-    CategorySerializer, DashboardSerializer
+    CategorySerializer, DashboardSerializer, WeeklySummarySerializer
 )
+from .throttling import CompleteUserThrottle, CompleteIPThrottle
+from .filters import filter_habits, filter_completions
+from .outbox import include_pending_points
+from .summaries import week_start_for
 
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -23,7 +28,10 @@ class HabitViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Habit.objects.filter(user=self.request.user, is_active=True)
+        queryset = Habit.objects.filter(user=self.request.user, is_active=True)
+        if self.action == 'list':
+            queryset = filter_habits(queryset, self.request.query_params)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -33,7 +41,13 @@ class HabitViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
     
-    @action(detail=True, methods=['post'])
+    def perform_destroy(self, instance):
+        """Archive the habit; its history is removed later by ``purge_archived``."""
+        instance.is_active = False
+        instance.archived_at = timezone.now()
+        instance.save(update_fields=['is_active', 'archived_at', 'updated_at'])
+    
+    @action(detail=True, methods=['post'], throttle_classes=[CompleteUserThrottle, CompleteIPThrottle])
     def complete(self, request, pk=None):
         """Mark a habit as completed for today."""
         habit = self.get_object()
@@ -56,32 +70,59 @@ class HabitViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
-        """Get dashboard data for the user."""
-        user = request.user
+        """Get dashboard data for the user.
+        
+        Only the fields kept by ``?fields=``/``?omit=`` are computed.
+        """
         habits = self.get_queryset()
+        dashboard_data = {}
+        serializer = DashboardSerializer(dashboard_data, context=self.get_serializer_context())
+        fields = serializer.fields
         
-        # Calculate stats
-        total_habits = habits.count()
-        completed_today = sum(1 for habit in habits if habit.is_completed_today())
+        if fields.keys() & {'total_points', 'current_level', 'level_progress'}:
+            user = include_pending_points(request.user)
+            dashboard_data.update({
+                'total_points': user.total_points,
+                'current_level': user.current_level,
+                'level_progress': user.get_level_progress(),
+            })
+        if 'total_habits' in fields:
+            dashboard_data['total_habits'] = habits.count()
+        if 'completed_today' in fields:
+            dashboard_data['completed_today'] = habits.completed(timezone.localdate()).count()
+        if 'habits' in fields:
+            dashboard_data['habits'] = habits
+        if 'recent_completions' in fields:
+            # Get recent completions (last 7 days)
+            week_ago = date.today() - timedelta(days=7)
+            dashboard_data['recent_completions'] = Completion.objects.filter(
+                habit__user=request.user,
+                habit__archived_at__isnull=True,
+                completed_at__date__gte=week_ago
+            ).order_by('-completed_at')[:10]
         
-        # Get recent completions (last 7 days)
-        week_ago = date.today() - timedelta(days=7)
-        recent_completions = Completion.objects.filter(
-            habit__user=user,
-            completed_at__date__gte=week_ago
-        ).order_by('-completed_at')[:10]
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'], url_path='weekly-summary')
+    def weekly_summary(self, request):
+        """Get the user's stored summaries for the last ``weeks`` weeks, newest first.
         
-        dashboard_data = {
-            'total_habits': total_habits,
-            'completed_today': completed_today,
-            'total_points': user.total_points,
-            'current_level': user.current_level,
-            'level_progress': user.get_level_progress(),
-            'habits': habits,
-            'recent_completions': recent_completions
-        }
+        The current week counts as one of them.
+        """
+        try:
+            weeks = min(max(int(request.query_params.get('weeks', 4)), 1), 52)
+        except ValueError:
+            return Response(
+                {'error': 'weeks must be an integer'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        serializer = DashboardSerializer(dashboard_data)
+        # Weeks without activity have no snapshot, so bound by date, not row count.
+        first_week = week_start_for(timezone.localdate()) - timedelta(weeks=weeks - 1)
+        summaries = WeeklySummary.objects.filter(
+            user=request.user, week_start__gte=first_week
+        ).order_by('-week_start')
+        serializer = WeeklySummarySerializer(summaries, many=True)
         return Response(serializer.data)
 
 
@@ -90,6 +131,9 @@ class CompletionViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Completion.objects.filter(habit__user=self.request.user)
+        queryset = Completion.objects.filter(habit__user=self.request.user, habit__archived_at__isnull=True)
+        if self.action == 'list':
+            queryset = filter_completions(queryset, self.request.query_params)
+        return queryset
     
     serializer_class = CompletionSerializer
@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'habitbloom.settings')
+    # Tests run against local SQLite databases, see habitbloom/test_settings.py
+    settings_module = 'habitbloom.test_settings' if sys.argv[1:2] == ['test'] else 'habitbloom.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
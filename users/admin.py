@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from habitbloom.pagination import EstimatedCountPaginator
 from .models import User
 
 
@@ -8,7 +9,10 @@ class CustomUserAdmin(UserAdmin):
     list_display = ('email', 'username', 'total_points', 'current_level', 'is_active')
     list_filter = ('is_active', 'is_staff', 'current_level')
     search_fields = ('email', 'username')
+    date_hierarchy = 'created_at'
     ordering = ('-created_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = UserAdmin.fieldsets + (
         ('Gamification', {'fields': ('total_points', 'current_level')}),
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -7,8 +8,9 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     total_points = models.IntegerField(default=0)
     current_level = models.IntegerField(default=1)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
@@ -16,22 +18,38 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
     
+    @staticmethod
+    def level_for_points(points):
+        """Level reached with ``points`` total points."""
+        return (points // 100) + 1
+    
     def add_points(self, points):
-        """Add points and check for level up."""
+        """Add points and check for level up, without saving."""
         self.total_points += points
-        new_level = (self.total_points // 100) + 1
-        if new_level > self.current_level:
-            self.current_level = new_level
-        self.save()
+        self.current_level = max(self.current_level, self.level_for_points(self.total_points))
     
-    def get_level_progress(self):
-        """Get progress towards next level."""
-        current_level_points = (self.current_level - 1) * 100
-        next_level_points = self.current_level * 100
-        progress = self.total_points - current_level_points
+    def mark_deleted(self):
+        """Deactivate the account now; its data is removed by ``purge_archived``."""
+        self.is_active = False
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['is_active', 'deleted_at', 'updated_at'])
+        self.habits.filter(archived_at__isnull=True).update(
+            is_active=False, archived_at=self.deleted_at, updated_at=self.deleted_at
+        )
+    
+    @staticmethod
+    def level_progress_for(points, level):
+        """Progress from ``level`` towards the next level with ``points`` total points."""
+        current_level_points = (level - 1) * 100
+        next_level_points = level * 100
+        progress = points - current_level_points
         needed = next_level_points - current_level_points
         return {
             'current': progress,
             'needed': needed,
             'percentage': (progress / needed) * 100 if needed > 0 else 100
         }
+    
+    def get_level_progress(self):
+        """Get progress towards next level."""
+        return self.level_progress_for(self.total_points, self.current_level)
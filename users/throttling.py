@@ -0,0 +1,20 @@
+from habitbloom.throttling import IPTokenBucketThrottle, TokenBucketThrottle
+
+
+class LoginUserThrottle(TokenBucketThrottle):
+    """Limit login attempts against a single account, whichever IP they come from."""
+    scope = 'login_user'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': email.strip().lower()}
+
+
+class LoginIPThrottle(IPTokenBucketThrottle):
+    scope = 'login_ip'
+
+
+class RegisterIPThrottle(IPTokenBucketThrottle):
+    scope = 'register_ip'
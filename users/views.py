@@ -1,14 +1,17 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import login
+from habits.outbox import include_pending_points
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
+from .throttling import LoginUserThrottle, LoginIPThrottle, RegisterIPThrottle
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterIPThrottle])
 def register(request):
     """Register a new user."""
     serializer = UserRegistrationSerializer(data=request.data)
@@ -24,6 +27,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginUserThrottle, LoginIPThrottle])
 def login_view(request):
     """Login a user."""
     serializer = UserLoginSerializer(data=request.data)
@@ -42,10 +46,18 @@ def login_view(request):
 @permission_classes([IsAuthenticated])
 def profile(request):
     """Get user profile."""
-    serializer = UserSerializer(request.user)
+    serializer = UserSerializer(include_pending_points(request.user))
     return Response(serializer.data)
 
 
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_account(request):
+    """Delete the user's account."""
+    request.user.mark_deleted()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout(request):